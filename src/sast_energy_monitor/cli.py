@@ -2,11 +2,16 @@ import argparse
 import subprocess
 import sys
 import os
+import hashlib
+import shutil
+import threading
 from pathlib import Path
-import importlib.resources
 import tempfile
-import shlex  # <-- Added for safe command splitting
-from colorama import init as colorama_init, Fore, Style
+from functools import cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from importlib.resources.abc import Traversable
 
 # --- Package/Config Info ---
 # Ensure these match your actual package structure and config file names
@@ -20,14 +25,49 @@ SEMGREP_CONFIG_FILES = {
     "loose": "semgrep.yml",
     "strict": "p/bandit",  # Using Semgrep registry path for strict
 }
+# Line printed by Energibridge's --summary option
+ENERGY_SUMMARY_MARKER = "Energy consumption in joules:"
+ENERGY_SUMMARY_MARKER_BYTES = ENERGY_SUMMARY_MARKER.encode()
+# Scanner exit codes that are expected rather than exceptional
+FINDINGS_EXIT_CODE = 1             # Bandit/Semgrep: scan succeeded and reported findings
+BANDIT_CONFIG_ERROR_EXIT_CODE = 2  # Bandit: config file or argument error
 # ---
 
-# Initialize colorama
-colorama_init(autoreset=True)
+# Resolved scanner config arguments (bundled file path or registry id), keyed by (tool, config_level).
+_RESOLVED_CONFIGS: dict[tuple[str, str], str] = {}
+
+
+class _NoColor:
+    """Stand-in for colorama's Fore/Style that yields empty strings for every attribute."""
+    def __getattr__(self, name):
+        return ""
 
 
-def get_package_config_path(config_filename: str) -> importlib.resources.abc.Traversable:
-    """Gets a traversable object for a config file bundled within the package."""
+# Plain-text placeholders until _init_colors() runs (after argument parsing),
+# so `--help` and argument errors never pay for importing colorama.
+Fore = Style = _NoColor()
+# Dimmed separator line, precomputed once colors are known (see _init_colors)
+_SEP = "-" * 60
+
+
+def _init_colors():
+    """
+    Initializes colorama only for interactive terminals; piped/redirected output
+    (CI logs, files) keeps the plain-text placeholders and skips colorama's
+    stream wrapping entirely.
+    """
+    global Fore, Style, _SEP
+    if sys.stdout.isatty():
+        from colorama import init as colorama_init, Fore, Style
+        colorama_init(autoreset=True)
+        _SEP = Style.DIM + "-" * 60
+
+
+@cache
+def get_package_config_path(config_filename: str) -> "Traversable":
+    """Gets a traversable object for a config file bundled within the package (cached per filename)."""
+    import importlib.resources # Deferred: only needed once a bundled config is requested
+
     try:
         package_files = importlib.resources.files(PACKAGE_NAME)
         config_path = package_files / CONFIG_DIR_NAME / config_filename
@@ -42,218 +82,347 @@ def get_package_config_path(config_filename: str) -> importlib.resources.abc.Tra
         ) from e
 
 
-def build_scan_command(tool: str, config_level: str, repo_path: Path) -> str:
+def _user_cache_dir() -> Path:
+    """Returns the per-user cache directory used for extracted config files."""
+    if os.name == 'nt':
+        base_dir = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base_dir = Path.home() / "Library" / "Caches"
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base_dir) / PACKAGE_NAME
+
+
+def ensure_cached_config(config_filename: str) -> Path:
     """
-    Builds the static analysis command string using bundled or registry configurations.
+    Returns a persistent on-disk path for a bundled config file.
 
-    Args:
-        tool: 'bandit' or 'semgrep'.
-        config_level: 'strict' or 'loose'.
-        repo_path: Path to the repository to scan.
+    Configs installed as regular files are used in place. Otherwise (e.g. zipped
+    installs) the config is extracted once into the user cache directory, named
+    after a hash of its contents, and reused by later runs.
+    """
+    bundled_config_ref = get_package_config_path(config_filename)
+    if isinstance(bundled_config_ref, Path):  # Already a real file, nothing to extract
+        return bundled_config_ref.resolve()
+
+    config_bytes = bundled_config_ref.read_bytes()
+    config_hash = hashlib.sha1(config_bytes, usedforsecurity=False).hexdigest()
+    cache_dir = _user_cache_dir()
+    cached_config_path = cache_dir / f"{config_hash}-{config_filename}"
+
+    if not cached_config_path.is_file():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so a concurrent run never sees a partial config
+        fd, temp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(config_bytes)
+            os.replace(temp_name, cached_config_path)
+        except BaseException:
+            os.unlink(temp_name) # Don't leave partial temp files behind in the cache dir
+            raise
 
-    Returns:
-        The command string for the scanner.
+    return cached_config_path
+
+
+def resolve_scan_config(tool: str, config_level: str) -> str:
+    """
+    Resolves the config argument passed to the scanner for a tool/config level:
+    an absolute path for bundled config files, or a registry id for semgrep strict.
+    The result is memoized per (tool, config_level) for the rest of the process.
 
     Raises:
         FileNotFoundError: If a required bundled config file is not found.
         ValueError: If the tool or config_level is invalid.
     """
-    scan_command = ""
-    repo_path_str = str(repo_path.resolve())  # Ensure absolute path as string
+    cache_key = (tool, config_level)
+    config_arg = _RESOLVED_CONFIGS.get(cache_key)
+    if config_arg is not None:
+        return config_arg
 
     if tool == "bandit":
-        if config_level not in BANDIT_CONFIG_FILES:
+        config_filename = BANDIT_CONFIG_FILES.get(config_level)
+        if config_filename is None:
             raise ValueError(f"Invalid config level '{config_level}' for bandit.")
 
-        config_filename = BANDIT_CONFIG_FILES[config_level]
         print(Fore.CYAN + f"Info: Using bandit {config_level} config ('{config_filename}')")
-
-        bundled_config_ref = get_package_config_path(config_filename)
-        # Use 'with' to ensure temporary file (if created by as_file) is handled
-        with importlib.resources.as_file(bundled_config_ref) as config_file_path:
-            config_path_str = str(config_file_path.resolve())
-            print(Fore.CYAN + f"Using config file resolved to: {config_path_str}")
-            # Ensure paths are quoted within the command string itself for clarity,
-            # though shlex.split should handle them correctly later.
-            scan_command = f'bandit -c "{config_path_str}" -r "{repo_path_str}"'
+        config_arg = str(ensure_cached_config(config_filename))
+        print(Fore.CYAN + f"Using config file resolved to: {config_arg}")
 
     elif tool == "semgrep":
-        if config_level not in SEMGREP_CONFIG_FILES:
+        config_identifier = SEMGREP_CONFIG_FILES.get(config_level)
+        if config_identifier is None:
             raise ValueError(f"Invalid config level '{config_level}' for semgrep.")
 
-        config_identifier = SEMGREP_CONFIG_FILES[config_level]
-
         if config_level == "loose":  # Loose uses a bundled file
             print(Fore.CYAN + f"Info: Using semgrep loose config ('{config_identifier}')")
-            bundled_config_ref = get_package_config_path(config_identifier)
-            with importlib.resources.as_file(bundled_config_ref) as config_file_path:
-                config_path_str = str(config_file_path.resolve())
-                print(Fore.CYAN + f"Using config file resolved to: {config_path_str}")
-                scan_command = f'semgrep scan "{repo_path_str}" --verbose --config={config_path_str}'
+            config_arg = str(ensure_cached_config(config_identifier))
+            print(Fore.CYAN + f"Using config file resolved to: {config_arg}")
 
         elif config_level == "strict":  # Strict uses a registry path
             print(Fore.CYAN + f"Info: Using semgrep strict config ('{config_identifier}' from registry)")
-            # Need to quote the registry path if it contains special chars, though 'p/bandit' is safe.
-            # Using f-string quoting ensures it's treated as one argument by shlex.split.
-            scan_command = f'semgrep scan "{repo_path_str}" --verbose --config={config_identifier}'
+            config_arg = config_identifier
         else:
             raise ValueError(f"Unhandled semgrep config level: {config_level}")
 
     else:
         raise ValueError(f"Unsupported tool: {tool}. Use 'bandit' or 'semgrep'.")
 
-    return scan_command
+    _RESOLVED_CONFIGS[cache_key] = config_arg
+    return config_arg
 
 
-# Corrected function using list-based command execution
-def run_measurement(energibridge_path: Path, scan_cmd: str, tool_name: str, config_level: str):
+def build_scan_command(tool: str, config_level: str, *repo_paths: Path) -> list[str]:
     """
-    Runs the scan command wrapped by energibridge, using list-based execution
-    to avoid shell interpretation issues. Handles expected exit codes, redirects
-    periodic data, and prints results/summary with colors.
+    Builds the static analysis command (as an argument list) using bundled or registry configurations.
+
+    Args:
+        tool: 'bandit' or 'semgrep'.
+        config_level: 'strict' or 'loose'.
+        *repo_paths: Absolute (already resolved) paths of one or more repositories
+            to scan. Several paths are scanned by a single scanner invocation.
+
+    Returns:
+        The command for the scanner as a list of arguments, ready for subprocess.
+
+    Raises:
+        FileNotFoundError: If a required bundled config file is not found.
+        ValueError: If the tool or config_level is invalid.
     """
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=True) as temp_output_file:
-        temp_file_path = Path(temp_output_file.name).resolve() # Ensure temp path is absolute Path object
-        print(Fore.CYAN + f"Redirecting Energibridge periodic data to temporary file: {temp_file_path}")
-
-        # --- Prepare Command List ---
-        energibridge_abs_path = str(energibridge_path.resolve())
-        temp_file_abs_str = str(temp_file_path)
-
-        # Base command parts for Energibridge
-        base_command_list = [
-            energibridge_abs_path,
-            "-o", temp_file_abs_str,
-            "--summary"
-            # The actual scan command will be appended here
-        ]
-
-        # Safely split the scan_cmd generated by build_scan_command.
-        try:
-            # Use posix=False on Windows for better handling of backslashes in paths
-            # shlex should correctly handle the quotes we put in build_scan_command
-            scan_cmd_parts = shlex.split(scan_cmd, posix=(os.name != 'nt'))
-            scan_cmd_parts = [arg.strip('"') for arg in scan_cmd_parts]
+    if not repo_paths:
+        raise ValueError("At least one repository path is required.")
 
-            # print(Fore.CYAN + f"DEBUG: Split scan command parts: {scan_cmd_parts}")
-        except Exception as e:
-             print(Fore.RED + Style.BRIGHT + f"Internal Error: Could not split scan command '{scan_cmd}'. Error: {e}", file=sys.stderr)
-             sys.exit(1)
+    config_arg = resolve_scan_config(tool, config_level)
+    repo_path_strs = [str(repo_path) for repo_path in repo_paths]  # Caller passes already resolved paths
 
-        # Combine Energibridge command with the split scan command parts
-        command_list = base_command_list + scan_cmd_parts
+    if tool == "bandit":
+        return ["bandit", "-c", config_arg, "-r", *repo_path_strs]
+    return ["semgrep", "scan", *repo_path_strs, "--verbose", f"--config={config_arg}"]
 
-        print(Style.DIM + "-" * 60)
-        print(f"Starting {tool_name} scan ({config_level} config)...")
-        # Print the list clearly for debugging
-        # print(Fore.BLUE + f"Executing list: {command_list}")
-        print(Style.DIM + "-" * 60)
 
-        try:
-            # Run the command as a list, shell=False is the default and safer
-            result = subprocess.run(
-                command_list,
-                check=True, # Still check for errors initially
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                # Add current working directory if necessary, but shouldn't be needed here
-                # cwd=...
-            )
+def read_repos_file(repos_file: Path) -> list[Path]:
+    """
+    Reads repository paths from a text file, one per line.
+
+    Blank lines and lines starting with '#' are ignored. Relative paths are taken
+    relative to the directory containing the repos file.
 
+    Raises:
+        FileNotFoundError: If the repos file does not exist.
+        ValueError: If the file lists no repositories or a listed path is not a directory.
+    """
+    base_dir = repos_file.parent
+    repo_paths = []
+    with open(repos_file, encoding='utf-8') as f:
+        for line in f:
+            entry = line.strip()
+            if not entry or entry.startswith("#"):
+                continue
+            repo_path = base_dir / Path(entry).expanduser()
+            if not repo_path.is_dir():
+                raise ValueError(f"Repository path listed in '{repos_file}' not found or is not a directory: '{entry}'")
+            repo_paths.append(repo_path.resolve())
+
+    if not repo_paths:
+        raise ValueError(f"No repository paths listed in '{repos_file}'.")
+    return repo_paths
+
+
+def _write_block(lines: list[str], stream=None):
+    """
+    Writes several (possibly colored) lines with a single write() call and flushes.
+    Each line is followed by an explicit style reset, since autoreset only applies
+    once per write.
+    """
+    stream = stream if stream is not None else sys.stdout
+    stream.write("".join(line + Style.RESET_ALL + "\n" for line in lines))
+    stream.flush()
+
+
+def _relay_stream(stream, destination, line_counts: dict, stream_name: str):
+    """
+    Copies lines from a binary child process pipe to the given destination as
+    they arrive, highlighting the Energibridge energy summary. Tool output is
+    passed through as raw bytes from the child's binary pipe and never decoded
+    as a whole; only the summary line is decoded (so it can be colored through
+    the text stream). Counts relayed lines per stream.
+    """
+    raw_destination = getattr(destination, "buffer", None) # Absent on some replaced streams
+    raw_write = raw_destination.write if raw_destination is not None else None
+    # Interactive destinations get every line immediately (live progress, stdout/stderr order);
+    # piped output may stay block-buffered
+    flush_each_line = getattr(destination, "line_buffering", False) or destination.isatty()
+    highlight_prefix = Fore.MAGENTA + Style.BRIGHT
+    for line in stream:
+        line_counts[stream_name] += 1
+        if raw_write is not None and ENERGY_SUMMARY_MARKER_BYTES not in line:
+            raw_write(line) # Print normal tool output, undecoded
+            if flush_each_line:
+                raw_destination.flush()
+            continue
+
+        text_line = line.decode("utf-8", errors="replace").rstrip("\r\n")
+        if raw_destination is not None:
+            raw_destination.flush() # Keep ordering with the bytes written so far
+        if ENERGY_SUMMARY_MARKER in text_line:
+            text_line = highlight_prefix + text_line + Style.RESET_ALL # Highlight energy summary
+        destination.write(text_line + "\n")
+        destination.flush()
+    if raw_destination is not None:
+        raw_destination.flush()
+    stream.close()
+
+
+def execute_scan(command_list: list[str], tool_name: str, config_level: str, measured: bool = False):
+    """
+    Runs a scan command (optionally wrapped by energibridge), using list-based
+    execution to avoid shell interpretation issues. Tool output is streamed line
+    by line while the scan runs (instead of being buffered until exit), then
+    expected exit codes are handled and the result is summarized with colors.
+    Exits the process on failure.
+
+    Args:
+        command_list: The full command to execute.
+        tool_name: 'bandit' or 'semgrep', used to interpret exit codes.
+        config_level: 'strict' or 'loose', for display only.
+        measured: Whether command_list is wrapped by energibridge (affects messages only).
+    """
+    # Print the list clearly for debugging
+    # print(Fore.BLUE + f"Executing list: {command_list}")
+    _write_block([
+        _SEP,
+        f"Starting {tool_name} scan ({config_level} config)...",
+        _SEP,
+    ])
+
+    try:
+        # Run the command as a list, shell=False is the default and safer
+        process = subprocess.Popen(
+            command_list,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            # Python-created FDs are non-inheritable anyway (PEP 446); skipping the
+            # close-fds sweep lets CPython use the cheaper posix_spawn path on Linux.
+            close_fds=False,
+        )
+
+        # Relay stderr from a helper thread so neither pipe can fill up and block the child
+        line_counts = {"stdout": 0, "stderr": 0}
+        stderr_thread = threading.Thread(
+            target=_relay_stream,
+            args=(process.stderr, sys.stderr, line_counts, "stderr"),
+            daemon=True,
+        )
+        stderr_thread.start()
+        _relay_stream(process.stdout, sys.stdout, line_counts, "stdout")
+        returncode = process.wait()
+        stderr_thread.join()
+
+        # --- Handle exit codes (non-zero is routine here, so no check=True/CalledProcessError) ---
+        if returncode == 0:
             # --- Process successful run (exit code 0) ---
-            print(Fore.GREEN + Style.BRIGHT + f"\n--- {tool_name.capitalize()} Scan Successful & Energy Summary (Exit Code 0) ---")
-            if result.stderr:
-                # stderr might contain warnings even on success
-                print(Fore.YELLOW + "\n--- Standard Error Output (Warnings/Info) ---")
-                print(result.stderr.strip())
-            if result.stdout:
-                lines = result.stdout.strip().splitlines()
-                for line in lines:
-                    if "Energy consumption in joules:" in line:
-                        print(Fore.MAGENTA + Style.BRIGHT + line) # Highlight energy summary
-                    else:
-                        print(line) # Print normal tool output
-
-        except subprocess.CalledProcessError as e:
-            # --- Handle known non-zero exit codes ---
-            expected_findings_exit_code = 1 # Common for bandit findings
-            bandit_config_error_code = 2    # Common for Bandit config/arg errors
-
-            # Check for Bandit's specific config error first
-            if tool_name == 'bandit' and e.returncode == bandit_config_error_code:
-                 print(Fore.RED + Style.BRIGHT + f"Error: {tool_name.capitalize()} failed with Exit Code {e.returncode}. This often indicates a configuration file issue or command argument error.", file=sys.stderr)
-                 print(Fore.RED + Style.BRIGHT + "Please check the scanner's error message below.", file=sys.stderr)
-                 # Print output and exit as it's an actual execution error
-                 print(Fore.RED + "\n--- Tool/Energibridge Output (stderr) ---", file=sys.stderr)
-                 print(e.stderr.strip() if e.stderr else "[No stderr]", file=sys.stderr)
-                 print(Fore.RED + "\n--- Tool/Energibridge Output (stdout) ---", file=sys.stderr)
-                 print(e.stdout.strip() if e.stdout else "[No stdout]", file=sys.stderr)
-                 print("\n" + Style.DIM + "-" * 60, file=sys.stderr)
-                 print(Fore.RED + f"Measurement failed due to tool error. Temp file was: {temp_file_path}", file=sys.stderr)
-                 sys.exit(1) # Exit with error status
-
-            # Check for expected "findings detected" exit code
-            elif tool_name in ['bandit', 'semgrep'] and e.returncode == expected_findings_exit_code:
-                print(Fore.YELLOW + Style.BRIGHT + f"\n--- {tool_name.capitalize()} Scan Found Issues (Exit Code {e.returncode}) ---")
-                output_found = False
-                if e.stderr:
-                    # Avoid duplicate headers if stderr also contains the summary line (less likely)
-                    print_stderr_header = True
-                    if e.stdout and "Energy consumption in joules:" in e.stdout:
-                        if "Energy consumption in joules:" in e.stderr:
-                             print_stderr_header = False # Already shown via stdout
-                    if print_stderr_header:
-                         print(Style.BRIGHT + "\n--- Standard Error Output ---")
-                    print(e.stderr.strip())
-                    output_found = True
-
-                if e.stdout:
-                    output_found = True
-                    print(Style.BRIGHT + "--- Standard Output & Energibridge Summary ---")
-                    lines = e.stdout.strip().splitlines()
-                    for line in lines:
-                         if "Energy consumption in joules:" in line:
-                              print(Fore.MAGENTA + Style.BRIGHT + line) # Highlight energy summary
-                         else:
-                              print(line) # Print normal tool output
-
-                if not output_found:
-                    print("[No output captured on stdout or stderr]")
-
-                print(Fore.CYAN + f"\nNote: {tool_name.capitalize()} exit code {e.returncode} usually indicates findings were detected. Treated as successful scan for energy measurement.")
-
-            # --- Handle *other* unexpected non-zero exit codes ---
-            else:
-                 print(e)
-                 print(Fore.RED + Style.BRIGHT + f"Error: Command execution failed with unexpected exit code {e.returncode}", file=sys.stderr)
-                 print(Fore.RED + "\n--- Tool/Energibridge Output (stderr) ---", file=sys.stderr)
-                 print(e.stderr.strip() if e.stderr else "[No stderr]", file=sys.stderr)
-                 print(Fore.RED + "\n--- Tool/Energibridge Output (stdout) ---", file=sys.stderr)
-                 print(e.stdout.strip() if e.stdout else "[No stdout]", file=sys.stderr)
-                 print("\n" + Style.DIM + "-" * 60, file=sys.stderr)
-                 print(Fore.RED + f"Measurement failed. Check logs. Temp file was: {temp_file_path}", file=sys.stderr)
-                 sys.exit(1) # Exit with error status
-
-        except FileNotFoundError:
-            # This error means the *first element* of command_list (energibridge) wasn't found
-            print(Fore.RED + Style.BRIGHT + f"Error: Command failed. Could not find executable: '{command_list[0]}'.", file=sys.stderr)
+            _write_block([Fore.GREEN + Style.BRIGHT + f"\n--- {tool_name.capitalize()} Scan Successful (Exit Code 0) ---"])
+
+        # Check for Bandit's specific config error first
+        elif tool_name == 'bandit' and returncode == BANDIT_CONFIG_ERROR_EXIT_CODE:
+             _write_block([
+                 Fore.RED + Style.BRIGHT + f"Error: {tool_name.capitalize()} failed with Exit Code {returncode}. This often indicates a configuration file issue or command argument error.",
+                 Fore.RED + Style.BRIGHT + "Please check the scanner's error message above.",
+                 "\n" + _SEP,
+                 Fore.RED + f"{'Measurement' if measured else 'Scan'} failed due to tool error.",
+             ], sys.stderr)
+             sys.exit(1) # Exit with error status
+
+        # Check for expected "findings detected" exit code
+        elif tool_name in ('bandit', 'semgrep') and returncode == FINDINGS_EXIT_CODE:
+            findings_block = [Fore.YELLOW + Style.BRIGHT + f"\n--- {tool_name.capitalize()} Scan Found Issues (Exit Code {returncode}) ---"]
+            if not (line_counts["stdout"] or line_counts["stderr"]):
+                findings_block.append("[No output captured on stdout or stderr]")
+            findings_block.append(Fore.CYAN + f"\nNote: {tool_name.capitalize()} exit code {returncode} usually indicates findings were detected. Treated as successful scan{' for energy measurement' if measured else ''}.")
+            _write_block(findings_block)
+
+        # --- Handle *other* unexpected non-zero exit codes ---
+        else:
+             error_block = [Fore.RED + Style.BRIGHT + f"Error: Command execution failed with unexpected exit code {returncode}"]
+             if not (line_counts["stdout"] or line_counts["stderr"]):
+                 error_block.append("[No output captured on stdout or stderr]")
+             error_block.append("\n" + _SEP)
+             error_block.append(Fore.RED + f"{'Measurement' if measured else 'Scan'} failed. Check logs.")
+             _write_block(error_block, sys.stderr)
+             sys.exit(1) # Exit with error status
+
+    except FileNotFoundError:
+        # This error means the *first element* of command_list wasn't found
+        print(Fore.RED + Style.BRIGHT + f"Error: Command failed. Could not find executable: '{command_list[0]}'.", file=sys.stderr)
+        if measured:
             print(Fore.RED + Style.BRIGHT + f"Ensure the Energibridge path argument is correct.", file=sys.stderr)
             # It *could* also be the scanner tool if energibridge tried to run it and failed,
-            # but that would likely be a CalledProcessError from energibridge itself.
+            # but that would show up as a non-zero exit code from energibridge itself.
             # Checking the scanner path is still good advice.
             print(Fore.RED + Style.BRIGHT + f"Also ensure '{tool_name}' is installed and accessible in the system PATH.", file=sys.stderr)
-            sys.exit(1)
-        except Exception as e:
-            # Catch any other unexpected Python errors during execution
-            print(Fore.RED + Style.BRIGHT + f"An unexpected Python error occurred during measurement execution: {e}", file=sys.stderr)
-            print(f"(Command attempted: {command_list})", file=sys.stderr)
-            print(f"Temporary data file was: {temp_file_path}", file=sys.stderr)
-            sys.exit(1)
+        else:
+            print(Fore.RED + Style.BRIGHT + f"Ensure '{tool_name}' is installed and accessible in the system PATH.", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        # Catch any other unexpected Python errors during execution
+        print(Fore.RED + Style.BRIGHT + f"An unexpected Python error occurred during scan execution: {e}", file=sys.stderr)
+        print(f"(Command attempted: {command_list})", file=sys.stderr)
+        sys.exit(1)
+
 
-    print(Style.DIM + "-" * 60)
-     # Use GREEN for the final success message (reached if no sys.exit happened)
-    print(Fore.GREEN + "Measurement process finished.")
+def _resolve_scanner(scan_cmd_parts: list[str], tool_name: str) -> list[str]:
+    """
+    Looks up the scanner executable on PATH before anything is spawned and returns
+    the scan command with its first element replaced by the resolved path.
+    Exits with an error if the scanner is not installed.
+    """
+    scanner_exe = shutil.which(scan_cmd_parts[0])
+    if scanner_exe is None:
+        print(Fore.RED + Style.BRIGHT + f"Error: Could not find '{tool_name}' on the system PATH. Ensure it is installed and accessible.", file=sys.stderr)
+        sys.exit(1)
+    return [scanner_exe, *scan_cmd_parts[1:]]
+
+
+def run_measurement(energibridge_path: Path, scan_cmd_parts: list[str], tool_name: str, config_level: str):
+    """
+    Runs the scan command wrapped by energibridge, discarding its periodic data
+    and printing the energy summary with the results.
+    """
+    scan_cmd_parts = _resolve_scanner(scan_cmd_parts, tool_name) # Fail fast, before any process is spawned
+
+    # Periodic CSV samples are intentionally discarded (os.devnull is /dev/null or NUL):
+    # this script never reads them, only the --summary line Energibridge prints to stdout.
+    periodic_output_str = os.devnull
+
+    # --- Prepare Command List ---
+    energibridge_abs_path = str(energibridge_path) # Resolved once by the caller
+
+    # Base command parts for Energibridge
+    base_command_list = [
+        energibridge_abs_path,
+        "-o", periodic_output_str,
+        "--summary"
+        # The actual scan command will be appended here
+    ]
+
+    # Combine Energibridge command with the scan command parts
+    command_list = base_command_list + scan_cmd_parts
+    execute_scan(command_list, tool_name, config_level, measured=True)
+
+    # Use GREEN for the final success message (reached if no sys.exit happened)
+    _write_block([_SEP, Fore.GREEN + "Measurement process finished."])
+
+
+def run_scan(scan_cmd_parts: list[str], tool_name: str, config_level: str):
+    """
+    Runs the scan command directly, without the energibridge wrapper, for quick
+    previews of the scanner output. No energy data is collected.
+    """
+    scan_cmd_parts = _resolve_scanner(scan_cmd_parts, tool_name) # Fail fast on a PATH miss
+    print(Fore.CYAN + "Energy measurement disabled (--no-measure); running the scanner directly.")
+    execute_scan(scan_cmd_parts, tool_name, config_level)
+
+    _write_block([_SEP, Fore.GREEN + "Scan process finished."])
 
 
 def main():
@@ -261,34 +430,56 @@ def main():
         description="Run Bandit or Semgrep scans with specific configurations and measure energy consumption using Energibridge."
     )
     # --- Arguments ---
-    parser.add_argument("--energibridge-path", type=Path, required=True, help="Path to the energibridge executable.")
-    parser.add_argument("--repo-path", type=Path, required=True, help="Path to the code repository to scan.")
+    parser.add_argument("--energibridge-path", type=Path, help="Path to the energibridge executable (or its name, if it is on PATH). Required unless --no-measure is given.")
+    repo_group = parser.add_mutually_exclusive_group(required=True)
+    repo_group.add_argument("--repo-path", type=Path, help="Path to the code repository to scan.")
+    repo_group.add_argument("--repos-file", type=Path, help="Text file listing repository paths (one per line). All repositories are scanned in a single scanner run, measured as one batch.")
     parser.add_argument("--tool", choices=["bandit", "semgrep"], required=True, help="Static analysis tool to use.")
     parser.add_argument("--config-level", choices=["strict", "loose"], required=True, help="Configuration level ('strict' or 'loose'). Uses predefined configurations.")
+    parser.add_argument("--no-measure", action="store_true", help="Run the scanner directly without Energibridge (no energy measurement).")
     args = parser.parse_args()
+    _init_colors()
+
+    if not args.no_measure and args.energibridge_path is None:
+        parser.error("--energibridge-path is required unless --no-measure is given")
 
     # --- Input Validation ---
-    if not args.energibridge_path.is_file():
-        print(Fore.RED + Style.BRIGHT + f"Error: Energibridge executable not found at '{args.energibridge_path}'", file=sys.stderr)
-        sys.exit(1)
+    if not args.no_measure and not args.energibridge_path.is_file():
+        # Accept a bare command name (or relative path) that can be found via PATH
+        energibridge_exe = None if args.energibridge_path.is_absolute() else shutil.which(str(args.energibridge_path))
+        if energibridge_exe is None:
+            print(Fore.RED + Style.BRIGHT + f"Error: Energibridge executable not found at '{args.energibridge_path}'", file=sys.stderr)
+            sys.exit(1)
+        args.energibridge_path = Path(energibridge_exe)
     # Add execute permission check if needed (e.g., on Linux/macOS)
     # if os.name != 'nt' and not os.access(args.energibridge_path, os.X_OK):
     #     print(Fore.RED + Style.BRIGHT + f"Error: Energibridge file does not have execute permissions: '{args.energibridge_path}'", file=sys.stderr)
     #     sys.exit(1)
 
-    if not args.repo_path.is_dir():
+    if args.repo_path is not None and not args.repo_path.is_dir():
         print(Fore.RED + Style.BRIGHT + f"Error: Repository path not found or is not a directory: '{args.repo_path}'", file=sys.stderr)
         sys.exit(1)
 
     try:
+        # Resolve each path exactly once; everything below receives absolute paths
+        if args.repos_file is not None:
+            repo_paths_abs = read_repos_file(args.repos_file)
+            print(Fore.CYAN + f"Batching {len(repo_paths_abs)} repositories from '{args.repos_file}' into a single scan.")
+        else:
+            repo_paths_abs = [args.repo_path.resolve(strict=True)]
+
         # --- Build Scan Command ---
-        repo_path_abs = args.repo_path.resolve()
         print(Fore.CYAN + "Building scan command...")
-        scan_cmd_str = build_scan_command(args.tool, args.config_level, repo_path_abs)
-        print(Fore.CYAN + "Scan command string built.")
+        scan_cmd_parts = build_scan_command(args.tool, args.config_level, *repo_paths_abs)
+        print(Fore.CYAN + f"Scan command built: {scan_cmd_parts}")
 
-        # --- Run Measurement ---
-        run_measurement(args.energibridge_path.resolve(), scan_cmd_str, args.tool, args.config_level)
+        if args.no_measure:
+            # --- Run Scan Only ---
+            run_scan(scan_cmd_parts, args.tool, args.config_level)
+        else:
+            # --- Run Measurement ---
+            energibridge_path_abs = args.energibridge_path.resolve(strict=True)
+            run_measurement(energibridge_path_abs, scan_cmd_parts, args.tool, args.config_level)
 
     except FileNotFoundError as e: # Errors during command *building* (e.g., finding bundled config)
         print(Fore.RED + Style.BRIGHT + f"Error: Required file not found during setup. {e}", file=sys.stderr)